@@ -21,6 +21,8 @@ app = FastAPI()
 # Create a metric to track time spent and requests made.
 REQUEST_TIME = Summary('request_processing_seconds', 'Time spent processing request')
 REQUEST_COUNT = Counter('request_count', 'Total number of requests')
+STRATEGY_COUNT = Counter('execution_strategy_count', 'Number of predictions per execution strategy',
+                         ['model', 'backend'])
 
 # Define the base directory
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -29,12 +31,52 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 sklearn_model_path = os.path.join(BASE_DIR, 'models', 'sklearn.model')
 pytorch_model_path = os.path.join(BASE_DIR, 'models', 'pytorch.model')
 
-sklearn_model = SklearnClassifier(sklearn_model_path)
-pytorch_model = PytorchClassifier(pytorch_model_path)
+# Cost models calibrated offline (see autotune.py) are loaded from COST_MODEL_DIR,
+# which defaults to the directory autotune.py writes to (an empty value disables
+# loading), and AUTOTUNE=true benchmarks the execution strategies at startup instead.
+cost_model_dir = os.environ.get('COST_MODEL_DIR', os.path.join(BASE_DIR, 'models'))
+
+def cost_model_path(model_name):
+    """
+    Get the path of the offline cost model for a classifier, if there is one.
+
+    Args:
+        model_name (str): The name of the model ('sklearn' or 'pytorch').
+
+    Returns:
+        str: The path to the cost model file, or None if it does not exist.
+    """
+    if not cost_model_dir:
+        return None
+    path = os.path.join(cost_model_dir, f'{model_name}_cost_model.json')
+    return path if os.path.exists(path) else None
+
+sklearn_model = SklearnClassifier(sklearn_model_path, cost_model_path('sklearn'))
+pytorch_model = PytorchClassifier(pytorch_model_path, cost_model_path('pytorch'))
+
+if os.environ.get('AUTOTUNE', 'false').lower() == 'true':
+    sklearn_model.autotune()
+    pytorch_model.autotune()
 
 # Load labels
 labels = load_labels(os.path.join(BASE_DIR, 'models', 'output_labels.txt'))
 
+def predict(model_name, classifier, crystal_data):
+    """
+    Make predictions with the execution strategy selected for the batch size.
+
+    Args:
+        model_name (str): The name of the model ('sklearn' or 'pytorch').
+        classifier (SklearnClassifier | PytorchClassifier): The classifier to use.
+        crystal_data (List[List[float]]): The input samples.
+
+    Returns:
+        List[List[float]]: A list of prediction probabilities for each input sample.
+    """
+    strategy = classifier.select_strategy(len(crystal_data))
+    STRATEGY_COUNT.labels(model=model_name, backend=strategy.backend).inc()
+    return classifier.predict(crystal_data, strategy)
+
 class CrystalData(BaseModel):
     crystalData: List[conlist(float, min_length=4, max_length=4)]
 
@@ -67,7 +109,7 @@ def sklearn_endpoint(data: CrystalData):
         PredictionResponse: JSON response with the prediction and scores for each label.
     """
     try:
-        predictions = sklearn_model.predict(data.crystalData)
+        predictions = predict('sklearn', sklearn_model, data.crystalData)
         response = format_response(predictions, labels)
         return PredictionResponse(prediction=response["prediction"], scores=response["scores"])
     except ValidationError as e:
@@ -91,7 +133,7 @@ def pytorch_endpoint(data: CrystalData):
         PredictionResponse: JSON response with the prediction and scores for each label.
     """
     try:
-        predictions = pytorch_model.predict(data.crystalData)
+        predictions = predict('pytorch', pytorch_model, data.crystalData)
         response = format_response(predictions, labels)
         return PredictionResponse(prediction=response["prediction"], scores=response["scores"])
     except ValidationError as e:
@@ -124,9 +166,9 @@ def astromech_endpoint(data: Dict):
         validated_data = AstromechData(**data)
 
         if validated_data.model == 'sklearn':
-            predictions = sklearn_model.predict(validated_data.crystalData)
+            predictions = predict('sklearn', sklearn_model, validated_data.crystalData)
         else:
-            predictions = pytorch_model.predict(validated_data.crystalData)
+            predictions = predict('pytorch', pytorch_model, validated_data.crystalData)
         response = format_response(predictions, labels)
         return PredictionResponse(prediction=response["prediction"], scores=response["scores"])
     
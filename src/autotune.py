@@ -0,0 +1,42 @@
+import argparse
+import os
+import sys
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from models.pytorch_classifier import PytorchClassifier
+from models.sklearn_classifier import SklearnClassifier
+
+# Define the base directory
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def main():
+    """
+    Benchmark the execution strategies of both classifiers and save their cost models.
+
+    The files are written as '<model>_cost_model.json' in the output directory, which
+    the API loads at startup from COST_MODEL_DIR (src/models by default).
+    """
+    parser = argparse.ArgumentParser(description="Calibrate the classifiers' cost models.")
+    parser.add_argument('--output-dir', default=os.path.join(BASE_DIR, 'models'))
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    classifiers = {
+        'sklearn': SklearnClassifier(os.path.join(BASE_DIR, 'models', 'sklearn.model')),
+        'pytorch': PytorchClassifier(os.path.join(BASE_DIR, 'models', 'pytorch.model')),
+    }
+    os.makedirs(args.output_dir, exist_ok=True)
+    for model_name, classifier in classifiers.items():
+        classifier.autotune(repeats=args.repeats)
+        path = os.path.join(args.output_dir, f'{model_name}_cost_model.json')
+        classifier.cost_model.save(path)
+        print(f"{model_name}: saved cost model to {path}")
+        for batch_size in (1, 100, 100000):
+            print(f"  batch size {batch_size}: {classifier.select_strategy(batch_size)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+import json
+import logging
+import time
+from typing import Callable, Dict, List, NamedTuple, Sequence
+
+import numpy as np
+
+
+class ExecutionStrategy(NamedTuple):
+    """
+    A way of running a classifier over a batch of samples.
+
+    Only strategies that perform the same arithmetic on the same batch shape as the
+    default path are offered, so that the chosen strategy never changes a response.
+    Thread counts and chunk sizes are left to the libraries: both are process-wide or
+    shape-dependent and can change the rounding of the probabilities.
+
+    Attributes:
+        backend (str): The code path that performs the computation (e.g. 'numpy', 'sklearn', 'torch').
+    """
+    backend: str
+
+    def to_dict(self):
+        """
+        Converts the strategy into a JSON-serializable dictionary.
+
+        Returns:
+            dict: The strategy fields.
+        """
+        return {"backend": self.backend}
+
+
+logger = logging.getLogger(__name__)
+
+# Lower bound on a timing, so that timings rounded to zero do not make the fit weights infinite.
+MIN_SECONDS = 1e-9
+
+# Batch sizes benchmarked by the autotune, and probed for identical outputs at startup.
+AUTOTUNE_BATCH_SIZES = (1, 32, 1024, 16384)
+
+
+class CostModel:
+    """
+    A linear latency model used to pick the cheapest execution strategy for a batch size.
+
+    Each strategy is modelled as ``seconds = overhead + per_row * batch_size``. The
+    coefficients are fitted from benchmark timings, either at startup through
+    ``autotune`` or offline and restored with ``load``.
+
+    Attributes:
+        strategies (List[ExecutionStrategy]): The candidate strategies, the first one being the default.
+        coefficients (Dict[ExecutionStrategy, Tuple[float, float]]): The fitted (overhead, per_row) pairs.
+    """
+
+    def __init__(self, strategies: Sequence[ExecutionStrategy]):
+        """
+        Initializes the CostModel with a list of candidate strategies.
+
+        Args:
+            strategies (Sequence[ExecutionStrategy]): The candidate strategies, the first one being the default.
+        """
+        if not strategies:
+            raise ValueError("At least one execution strategy is required")
+        self.strategies: List[ExecutionStrategy] = list(strategies)
+        self.coefficients: Dict[ExecutionStrategy, tuple] = {}
+
+    @property
+    def default_strategy(self):
+        """
+        The strategy used while the model has not been calibrated.
+
+        Returns:
+            ExecutionStrategy: The first candidate strategy.
+        """
+        return self.strategies[0]
+
+    @property
+    def is_calibrated(self):
+        """
+        Whether any strategy has fitted coefficients.
+
+        Returns:
+            bool: True if the model can estimate costs, False otherwise.
+        """
+        return bool(self.coefficients)
+
+    def fit(self, timings: Dict[ExecutionStrategy, Dict[int, float]]):
+        """
+        Fits the per-strategy coefficients from benchmark timings.
+
+        The fit is weighted by ``1 / seconds`` so that it minimizes relative rather than
+        absolute errors; otherwise the largest batch dominates and the small batch
+        overhead, which drives the decision for single samples, is mostly noise.
+
+        Args:
+            timings (Dict[ExecutionStrategy, Dict[int, float]]): For each strategy, the measured seconds per batch size.
+        """
+        for strategy, samples in timings.items():
+            batch_sizes = np.array(list(samples.keys()), dtype=float)
+            seconds = np.maximum(np.array(list(samples.values()), dtype=float), MIN_SECONDS)
+            if len(batch_sizes) > 1:
+                per_row, overhead = np.polyfit(batch_sizes, seconds, 1, w=1 / seconds)
+            else:
+                per_row, overhead = 0.0, seconds[0]
+            self.coefficients[strategy] = (max(float(overhead), 0.0), max(float(per_row), 0.0))
+
+    def estimate(self, strategy: ExecutionStrategy, batch_size: int):
+        """
+        Estimates the latency of running a batch with a strategy.
+
+        Args:
+            strategy (ExecutionStrategy): The strategy to estimate.
+            batch_size (int): The number of samples in the batch.
+
+        Returns:
+            float: The estimated seconds, or infinity if the strategy was not calibrated.
+        """
+        if strategy not in self.coefficients:
+            return float("inf")
+        overhead, per_row = self.coefficients[strategy]
+        return overhead + per_row * batch_size
+
+    def select(self, batch_size: int):
+        """
+        Picks the cheapest strategy for a batch size.
+
+        Args:
+            batch_size (int): The number of samples in the batch.
+
+        Returns:
+            ExecutionStrategy: The strategy with the lowest estimated latency, or the default one if uncalibrated.
+        """
+        if not self.is_calibrated:
+            return self.default_strategy
+        return min(self.strategies, key=lambda strategy: self.estimate(strategy, batch_size))
+
+    def autotune(self, run: Callable[[List[List[float]], ExecutionStrategy], object], n_features: int,
+                 batch_sizes: Sequence[int] = AUTOTUNE_BATCH_SIZES, repeats: int = 5, seed: int = 0):
+        """
+        Benchmarks every strategy on random batches and fits the coefficients.
+
+        Args:
+            run (Callable): A function that predicts a batch with a given strategy.
+            n_features (int): The number of features per sample.
+            batch_sizes (Sequence[int]): The batch sizes to benchmark.
+            repeats (int): The number of timed runs per batch size; the fastest one is kept.
+            seed (int): The seed used to generate the random batches.
+
+        Returns:
+            Dict[ExecutionStrategy, Dict[int, float]]: The measured timings.
+        """
+        rng = np.random.default_rng(seed)
+        batches = {size: rng.random((size, n_features)).tolist() for size in batch_sizes}
+        timings = {}
+        for strategy in self.strategies:
+            timings[strategy] = {}
+            for size, batch in batches.items():
+                run(batch, strategy)  # warm-up
+                best = float("inf")
+                for _ in range(repeats):
+                    start = time.perf_counter()
+                    run(batch, strategy)
+                    best = min(best, time.perf_counter() - start)
+                timings[strategy][size] = best
+        self.fit(timings)
+        return timings
+
+    def save(self, file_path: str):
+        """
+        Saves the fitted coefficients to a JSON file.
+
+        Args:
+            file_path (str): Path to the output file.
+        """
+        entries = [
+            dict(strategy.to_dict(), overhead=overhead, per_row=per_row)
+            for strategy, (overhead, per_row) in self.coefficients.items()
+        ]
+        with open(file_path, 'w') as file:
+            json.dump({"strategies": entries}, file, indent=2)
+
+    def load(self, file_path: str):
+        """
+        Loads coefficients from a JSON file, ignoring strategies that are not candidates.
+
+        A missing or malformed file is logged and ignored, leaving the model as it was, so
+        that a stale calibration never prevents the service from starting.
+
+        Args:
+            file_path (str): Path to the file written by ``save``.
+        """
+        coefficients = {}
+        try:
+            with open(file_path, 'r') as file:
+                entries = json.load(file)["strategies"]
+            for entry in entries:
+                strategy = ExecutionStrategy(entry["backend"])
+                overhead, per_row = float(entry["overhead"]), float(entry["per_row"])
+                if not (np.isfinite(overhead) and np.isfinite(per_row)) or overhead < 0 or per_row < 0:
+                    raise ValueError(f"invalid coefficients for {strategy}: {overhead}, {per_row}")
+                if strategy in self.strategies:
+                    coefficients[strategy] = (overhead, per_row)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Ignoring cost model %s: %s", file_path, e)
+            return
+        self.coefficients.update(coefficients)
+
+
+def identical_strategies(run: Callable[[List[List[float]], ExecutionStrategy], list],
+                         strategies: Sequence[ExecutionStrategy], n_features: int,
+                         batch_sizes: Sequence[int] = AUTOTUNE_BATCH_SIZES, seed: int = 0):
+    """
+    Keeps only the strategies whose outputs match the default strategy exactly.
+
+    The first strategy is the reference. The candidates perform the same arithmetic
+    by construction; this guards against models where that does not hold (e.g. a
+    one-vs-rest LogisticRegression for the NumPy path). Every candidate is run on a
+    probe batch of each autotune batch size and dropped if any probability differs.
+
+    Args:
+        run (Callable): A function that predicts a batch with a given strategy.
+        strategies (Sequence[ExecutionStrategy]): The candidate strategies, the first one being the reference.
+        n_features (int): The number of features per sample.
+        batch_sizes (Sequence[int]): The batch sizes to probe.
+        seed (int): The seed used to generate the probe batches.
+
+    Returns:
+        List[ExecutionStrategy]: The strategies that produce identical outputs.
+    """
+    rng = np.random.default_rng(seed)
+    probes = [rng.random((size, n_features)).tolist() for size in batch_sizes]
+    reference, candidates = strategies[0], strategies[1:]
+    expected = [run(probe, reference) for probe in probes]
+    identical = [reference]
+    for strategy in candidates:
+        if all(run(probe, strategy) == output for probe, output in zip(probes, expected)):
+            identical.append(strategy)
+    return identical
+
+
+def log_strategies(classifier_name: str, candidates: Sequence[ExecutionStrategy],
+                   strategies: Sequence[ExecutionStrategy]):
+    """
+    Logs which candidate strategies a classifier kept after the identical outputs check.
+
+    Args:
+        classifier_name (str): The name of the classifier.
+        candidates (Sequence[ExecutionStrategy]): The candidate strategies.
+        strategies (Sequence[ExecutionStrategy]): The strategies that produce identical outputs.
+    """
+    dropped = [strategy for strategy in candidates if strategy not in strategies]
+    logger.info("%s execution strategies: %s (dropped for differing outputs: %s)",
+                classifier_name, list(strategies), dropped)
+    if len(strategies) == 1:
+        logger.warning("%s has a single execution strategy, batch size adaptation is disabled", classifier_name)
@@ -1,9 +1,12 @@
-from typing import List
+from typing import List, Optional
 
+import numpy as np
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
 
+from models.cost_model import CostModel, ExecutionStrategy, identical_strategies, log_strategies
+
 
 class Model(nn.Module):
     """
@@ -47,28 +50,105 @@ class PytorchClassifier:
 
     Attributes:
         model (Model): The pre-trained PyTorch model.
+        cost_model (CostModel): The cost model used to pick an execution strategy per batch size.
     """
-    def __init__(self, pytorch_model_path):
+    def __init__(self, pytorch_model_path, cost_model_path: Optional[str] = None):
         """
         Initializes the PytorchClassifier with a pre-trained model.
 
         Args:
             pytorch_model_path (str): The path to the pre-trained PyTorch model.
+            cost_model_path (Optional[str]): The path to cost model coefficients saved by an offline autotune.
         """
         self.model = Model()
         self.model.load_state_dict(torch.load(pytorch_model_path))
         self.model.eval()
+        self.n_features = self.model.layer1.in_features
+        candidates = [ExecutionStrategy("torch"), ExecutionStrategy("numpy")]
+        candidates = list(dict.fromkeys(candidates))
+        strategies = identical_strategies(self._run, candidates, self.n_features)
+        log_strategies("PytorchClassifier", candidates, strategies)
+        self.cost_model = CostModel(strategies)
+        if cost_model_path is not None:
+            self.cost_model.load(cost_model_path)
 
-    def predict(self, input_data: List[List[float]]):
+    def _run(self, input_data: List[List[float]], strategy: ExecutionStrategy):
         """
-        Makes predictions using the pre-trained PyTorch model.
+        Makes predictions with a given execution strategy.
 
         Args:
-            input_data (List[List[float]]): A list of input samples, where each sample is a list of features.
+            input_data (List[List[float]]): A list of input samples.
+            strategy (ExecutionStrategy): The execution strategy to use.
 
         Returns:
             List[List[float]]: A list of prediction probabilities for each input sample.
         """
+        if strategy.backend == "numpy":
+            return self._predict_numpy(input_data)
         with torch.no_grad():
             probas = self.model(torch.Tensor(input_data)).tolist()
         return probas
+
+    def _predict_numpy(self, input_data: List[List[float]]):
+        """
+        Runs the model on a tensor built through NumPy instead of from nested lists.
+
+        ``torch.Tensor`` converts nested lists element by element, which dominates the
+        latency of large batches. NumPy rounds each value to the same float32, and the
+        model runs the same forward pass on the same shape, so the outputs are identical.
+        Input that NumPy cannot convert is handed to the default path so that it raises
+        the same error.
+
+        Args:
+            input_data (List[List[float]]): A list of input samples.
+
+        Returns:
+            List[List[float]]: A list of prediction probabilities for each input sample.
+        """
+        try:
+            X = torch.from_numpy(np.asarray(input_data, dtype=np.float32))
+        except (TypeError, ValueError):
+            return self._run(input_data, ExecutionStrategy("torch"))
+        with torch.inference_mode():
+            probas = self.model(X).tolist()
+        return probas
+
+    def select_strategy(self, batch_size: int):
+        """
+        Picks the execution strategy with the lowest estimated latency for a batch size.
+
+        Args:
+            batch_size (int): The number of samples in the batch.
+
+        Returns:
+            ExecutionStrategy: The selected strategy.
+        """
+        return self.cost_model.select(batch_size)
+
+    def autotune(self, **kwargs):
+        """
+        Benchmarks the candidate strategies and calibrates the cost model.
+
+        Args:
+            **kwargs: Forwarded to ``CostModel.autotune``.
+
+        Returns:
+            Dict[ExecutionStrategy, Dict[int, float]]: The measured timings.
+        """
+        return self.cost_model.autotune(self._run, self.n_features, **kwargs)
+
+    def predict(self, input_data: List[List[float]], strategy: Optional[ExecutionStrategy] = None):
+        """
+        Makes predictions using the pre-trained PyTorch model.
+
+        Args:
+            input_data (List[List[float]]): A list of input samples, where each sample is a list of features.
+            strategy (Optional[ExecutionStrategy]): The execution strategy to use; selected from the batch size if None.
+
+        Returns:
+            List[List[float]]: A list of prediction probabilities for each input sample.
+        """
+        if strategy is None:
+            strategy = self.select_strategy(len(input_data))
+        probas = self._run(input_data, strategy)
+        return probas
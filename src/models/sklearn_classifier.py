@@ -1,7 +1,11 @@
-from typing import  List, Tuple
+from typing import  List, Optional, Tuple
 
+import numpy as np
 from joblib import load
 from sklearn.linear_model import LogisticRegression
+from sklearn.utils.extmath import softmax
+
+from models.cost_model import CostModel, ExecutionStrategy, identical_strategies, log_strategies
 
 
 class SklearnClassifier():
@@ -10,26 +14,100 @@ class SklearnClassifier():
 
     Attributes:
         model (LogisticRegression): The pre-trained Scikit-Learn model.
+        cost_model (CostModel): The cost model used to pick an execution strategy per batch size.
     """
 
-    def __init__(self, sklearn_model_path):
+    def __init__(self, sklearn_model_path, cost_model_path: Optional[str] = None):
         """
         Initializes the SklearnClassifier with a pre-trained model.
 
         Args:
             sklearn_model_path (str): The path to the pre-trained Scikit-Learn model.
+            cost_model_path (Optional[str]): The path to cost model coefficients saved by an offline autotune.
         """
         self.model: LogisticRegression = load(sklearn_model_path)
+        candidates = [ExecutionStrategy("sklearn"), ExecutionStrategy("numpy")]
+        strategies = identical_strategies(self._run, candidates, self.model.n_features_in_)
+        log_strategies("SklearnClassifier", candidates, strategies)
+        self.cost_model = CostModel(strategies)
+        if cost_model_path is not None:
+            self.cost_model.load(cost_model_path)
+
+    def _predict_numpy(self, input_data: List[List[float]]):
+        """
+        Computes the multinomial probabilities directly from the fitted coefficients.
+
+        This skips the input validation done by ``predict_proba``, which dominates the
+        latency of small batches, while performing the same arithmetic. Input that the
+        validation would reject (wrong shape, NaN or infinity) is handed to
+        ``predict_proba`` so that it raises the same error.
+
+        Args:
+            input_data (List[List[float]]): A list of input samples.
+
+        Returns:
+            numpy.ndarray: The prediction probabilities.
+        """
+        try:
+            X = np.asarray(input_data, dtype=np.float64)
+        except (TypeError, ValueError):
+            return self.model.predict_proba(input_data)
+        if X.ndim != 2 or X.shape[0] == 0 or X.shape[1] != self.model.n_features_in_ or not np.isfinite(X).all():
+            return self.model.predict_proba(input_data)
+        scores = X @ self.model.coef_.T + self.model.intercept_
+        return softmax(scores, copy=False)
+
+    def _run(self, input_data: List[List[float]], strategy: ExecutionStrategy):
+        """
+        Makes predictions with a given execution strategy.
+
+        Args:
+            input_data (List[List[float]]): A list of input samples.
+            strategy (ExecutionStrategy): The execution strategy to use.
+
+        Returns:
+            List[List[float]]: A list of prediction probabilities for each input sample.
+        """
+        if strategy.backend == "numpy":
+            return self._predict_numpy(input_data).tolist()
+        return self.model.predict_proba(input_data).tolist()
+
+    def select_strategy(self, batch_size: int):
+        """
+        Picks the execution strategy with the lowest estimated latency for a batch size.
+
+        Args:
+            batch_size (int): The number of samples in the batch.
+
+        Returns:
+            ExecutionStrategy: The selected strategy.
+        """
+        return self.cost_model.select(batch_size)
+
+    def autotune(self, **kwargs):
+        """
+        Benchmarks the candidate strategies and calibrates the cost model.
+
+        Args:
+            **kwargs: Forwarded to ``CostModel.autotune``.
+
+        Returns:
+            Dict[ExecutionStrategy, Dict[int, float]]: The measured timings.
+        """
+        return self.cost_model.autotune(self._run, self.model.n_features_in_, **kwargs)
 
-    def predict(self, input_data: List[List[float]]):
+    def predict(self, input_data: List[List[float]], strategy: Optional[ExecutionStrategy] = None):
         """
         Makes predictions using the pre-trained Scikit-Learn model.
 
         Args:
             input_data (List[List[float]]): A list of input samples, where each sample is a list of features.
+            strategy (Optional[ExecutionStrategy]): The execution strategy to use; selected from the batch size if None.
 
         Returns:
             List[List[float]]: A list of prediction probabilities for each input sample.
         """
-        probas = self.model.predict_proba(input_data).tolist()
+        if strategy is None:
+            strategy = self.select_strategy(len(input_data))
+        probas = self._run(input_data, strategy)
         return probas
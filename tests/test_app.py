@@ -1,11 +1,16 @@
 import pytest
 from fastapi.testclient import TestClient
+from prometheus_client.parser import text_string_to_metric_families
 import sys, os
 
 # Add the src directory to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 
-from app import app
+# Build the classifiers with their default strategies, ignoring any local calibration
+os.environ['COST_MODEL_DIR'] = ''
+os.environ['AUTOTUNE'] = 'false'
+
+from app import app, sklearn_model
 
 client = TestClient(app)
 
@@ -36,4 +41,18 @@ def test_astromech_endpoint_pytorch():
 def test_astromech_endpoint_invalid_model():
     response = client.post("/astromech", json={"crystalData": [[0.92, 0.12, 0.31, 0.09]], "model": "invalid_model"})
     assert response.status_code == 400
-    assert response.json() == {"detail": "Invalid model type"}
\ No newline at end of file
+    assert response.json() == {"detail": "Invalid model type"}
+
+def test_metrics_record_execution_strategy():
+    crystal_data = [[0.92, 0.12, 0.31, 0.09]]
+    strategy = sklearn_model.select_strategy(len(crystal_data))
+    response = client.post("/sklearn", json={"crystalData": crystal_data})
+    assert response.status_code == 200
+    samples = [
+        sample for family in text_string_to_metric_families(client.get("/metrics").text)
+        for sample in family.samples if sample.name == "execution_strategy_count_total"
+    ]
+    assert any(
+        sample.labels["model"] == "sklearn" and sample.labels["backend"] == strategy.backend and sample.value >= 1
+        for sample in samples
+    )
\ No newline at end of file
@@ -0,0 +1,119 @@
+import pytest
+import sys, os
+import torch
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from models.cost_model import CostModel, ExecutionStrategy
+from models.pytorch_classifier import PytorchClassifier
+from models.sklearn_classifier import SklearnClassifier
+
+MODELS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/models'))
+
+SMALL = ExecutionStrategy("numpy")
+LARGE = ExecutionStrategy("sklearn")
+
+crystal_data = [
+    [0.92, 0.12, 0.31, 0.09],
+    [0.31, 0.112, 0.311, 0.09],
+    [0.9212, 0.1112, 0.931, 0.409],
+    [0.43921, 0.1222, 0.22, 0.0911],
+]
+
+def test_uncalibrated_cost_model_uses_default_strategy():
+    cost_model = CostModel([LARGE, SMALL])
+    assert cost_model.select(1) == LARGE
+    assert cost_model.select(100000) == LARGE
+
+def test_cost_model_selects_by_batch_size():
+    cost_model = CostModel([LARGE, SMALL])
+    cost_model.fit({
+        SMALL: {1: 0.00001, 1000: 0.01},
+        LARGE: {1: 0.001, 1000: 0.002},
+    })
+    assert cost_model.select(1) == SMALL
+    assert cost_model.select(100000) == LARGE
+
+def test_cost_model_fit_keeps_small_batch_overhead():
+    cost_model = CostModel([LARGE])
+    cost_model.fit({LARGE: {1: 0.0001, 32: 0.00011, 1024: 0.001, 16384: 0.03}})
+    overhead, per_row = cost_model.coefficients[LARGE]
+    assert 0.00005 < overhead < 0.0001
+    assert cost_model.estimate(LARGE, 1) == pytest.approx(0.0001, rel=0.2)
+
+def test_cost_model_save_and_load(tmp_path):
+    cost_model = CostModel([LARGE, SMALL])
+    cost_model.fit({SMALL: {1: 0.00001, 1000: 0.01}, LARGE: {1: 0.001, 1000: 0.002}})
+    path = str(tmp_path / "cost_model.json")
+    cost_model.save(path)
+
+    loaded = CostModel([LARGE, SMALL])
+    loaded.load(path)
+    assert loaded.coefficients.keys() == cost_model.coefficients.keys()
+    for strategy in cost_model.strategies:
+        assert loaded.estimate(strategy, 10) == pytest.approx(cost_model.estimate(strategy, 10))
+
+def test_cost_model_fit_handles_zero_timings():
+    cost_model = CostModel([LARGE])
+    cost_model.fit({LARGE: {1: 0.0, 32: 0.0, 1024: 0.001}})
+    overhead, per_row = cost_model.coefficients[LARGE]
+    assert overhead >= 0 and per_row >= 0
+    assert cost_model.estimate(LARGE, 1024) < float("inf")
+
+@pytest.mark.parametrize("content", [
+    "not json",
+    '{"other": []}',
+    '{"strategies": [{"backend": "numpy"}]}',
+    '{"strategies": [{"backend": "numpy", "overhead": "fast", "per_row": 0.1}]}',
+    '{"strategies": [{"backend": "numpy", "overhead": -1, "per_row": 0.1}]}',
+])
+def test_cost_model_ignores_malformed_file(tmp_path, caplog, content):
+    path = tmp_path / "cost_model.json"
+    path.write_text(content)
+    cost_model = CostModel([LARGE, SMALL])
+    cost_model.load(str(path))
+    assert not cost_model.is_calibrated
+    assert cost_model.select(1) == LARGE
+    assert "Ignoring cost model" in caplog.text
+
+@pytest.fixture(scope="module")
+def sklearn_classifier():
+    return SklearnClassifier(os.path.join(MODELS_DIR, 'sklearn.model'))
+
+@pytest.fixture(scope="module")
+def pytorch_classifier():
+    return PytorchClassifier(os.path.join(MODELS_DIR, 'pytorch.model'))
+
+def test_sklearn_keeps_numpy_strategy(sklearn_classifier):
+    assert ExecutionStrategy("numpy") in sklearn_classifier.cost_model.strategies
+
+@pytest.mark.parametrize("strategy", [
+    ExecutionStrategy("sklearn"),
+    ExecutionStrategy("numpy"),
+])
+def test_sklearn_strategies_match_predict_proba(sklearn_classifier, strategy):
+    expected = sklearn_classifier.model.predict_proba(crystal_data).tolist()
+    assert sklearn_classifier._run(crystal_data, strategy) == expected
+
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), float("-inf")])
+@pytest.mark.parametrize("strategy", [ExecutionStrategy("sklearn"), ExecutionStrategy("numpy")])
+def test_sklearn_strategies_reject_non_finite_input(sklearn_classifier, strategy, value):
+    with pytest.raises(ValueError, match="Input X contains"):
+        sklearn_classifier._run([[value, 0.1, 0.2, 0.3]], strategy)
+
+def test_pytorch_keeps_numpy_strategy(pytorch_classifier):
+    assert ExecutionStrategy("numpy") in pytorch_classifier.cost_model.strategies
+
+@pytest.mark.parametrize("strategy", [ExecutionStrategy("torch"), ExecutionStrategy("numpy")])
+def test_pytorch_strategies_match_model(pytorch_classifier, strategy):
+    with torch.no_grad():
+        expected = pytorch_classifier.model(torch.Tensor(crystal_data)).tolist()
+    assert pytorch_classifier._run(crystal_data, strategy) == expected
+
+@pytest.mark.parametrize("classifier_name", ["sklearn_classifier", "pytorch_classifier"])
+def test_autotune_calibrates_every_strategy(classifier_name, request):
+    classifier = request.getfixturevalue(classifier_name)
+    classifier.autotune(batch_sizes=(1, 64), repeats=1)
+    assert set(classifier.cost_model.coefficients) == set(classifier.cost_model.strategies)
+    assert classifier.select_strategy(1) in classifier.cost_model.strategies
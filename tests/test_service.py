@@ -6,6 +6,10 @@ import sys, os
 # Add the src directory to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 
+# Build the classifiers with their default strategies, ignoring any local calibration
+os.environ['COST_MODEL_DIR'] = ''
+os.environ['AUTOTUNE'] = 'false'
+
 from app import app
 
 client = TestClient(app)